@@ -0,0 +1,88 @@
+"""
+Convert String(36) UUID keys to the native PostgreSQL uuid type.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15
+
+Foreign keys are dropped first so every key column can change type,
+then recreated with their original ON DELETE behavior.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+TABLES = ('users', 'addresses', 'products', 'orders', 'order_items')
+
+# ##>: (constraint, table, column, referenced table, ondelete) - default FK names.
+FOREIGN_KEYS = (
+    ('addresses_user_id_fkey', 'addresses', 'user_id', 'users', 'CASCADE'),
+    ('orders_user_id_fkey', 'orders', 'user_id', 'users', 'RESTRICT'),
+    (
+        'orders_shipping_address_id_fkey',
+        'orders',
+        'shipping_address_id',
+        'addresses',
+        'SET NULL',
+    ),
+    ('order_items_order_id_fkey', 'order_items', 'order_id', 'orders', 'CASCADE'),
+    (
+        'order_items_product_id_fkey',
+        'order_items',
+        'product_id',
+        'products',
+        'RESTRICT',
+    ),
+)
+
+
+def _key_columns():
+    """Yield every (table, column) pair holding a UUID key."""
+    for table in TABLES:
+        yield table, 'id'
+    for _, table, column, _, _ in FOREIGN_KEYS:
+        yield table, column
+
+
+def _drop_foreign_keys():
+    for name, table, _, _, _ in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+
+
+def _create_foreign_keys():
+    for name, table, column, referent, ondelete in FOREIGN_KEYS:
+        op.create_foreign_key(
+            name, table, referent, [column], ['id'], ondelete=ondelete
+        )
+
+
+def upgrade():
+    _drop_foreign_keys()
+    for table, column in _key_columns():
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.UUID(as_uuid=True),
+            existing_type=sa.String(36),
+            postgresql_using=f'{column}::uuid',
+        )
+    _create_foreign_keys()
+
+
+def downgrade():
+    _drop_foreign_keys()
+    for table, column in _key_columns():
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(36),
+            existing_type=postgresql.UUID(as_uuid=True),
+            postgresql_using=f'{column}::text',
+        )
+    _create_foreign_keys()
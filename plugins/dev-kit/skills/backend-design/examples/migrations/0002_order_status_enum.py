@@ -0,0 +1,52 @@
+"""
+Replace the orders.status string column and CHECK constraint with a native enum.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+STATUSES = ('pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled')
+STATUS_LIST_SQL = ', '.join(f"'{status}'" for status in STATUSES)
+ORDER_STATUS = postgresql.ENUM(*STATUSES, name='order_status', create_type=False)
+
+
+def upgrade():
+    op.execute(f'CREATE TYPE order_status AS ENUM ({STATUS_LIST_SQL})')
+
+    op.drop_constraint('ck_order_valid_status', 'orders', type_='check')
+    # ##!: Rewrites the table and rebuilds indexes on status - run in a
+    # ##!: maintenance window.
+    op.alter_column(
+        'orders',
+        'status',
+        type_=ORDER_STATUS,
+        existing_type=sa.String(20),
+        existing_nullable=False,
+        postgresql_using='status::order_status',
+    )
+
+
+def downgrade():
+    op.alter_column(
+        'orders',
+        'status',
+        type_=sa.String(20),
+        existing_type=ORDER_STATUS,
+        existing_nullable=False,
+        postgresql_using='status::text',
+    )
+    op.create_check_constraint(
+        'ck_order_valid_status', 'orders', f'status IN ({STATUS_LIST_SQL})'
+    )
+
+    op.execute('DROP TYPE order_status')
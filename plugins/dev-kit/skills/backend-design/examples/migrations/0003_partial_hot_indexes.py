@@ -0,0 +1,49 @@
+"""
+Restrict the order status and active user indexes to the rows queries target.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15
+
+Indexes are built and dropped CONCURRENTLY, which cannot run inside a
+transaction, so each statement runs in an autocommit block.
+"""
+
+from alembic import op
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_orders_open_status_created '
+            'ON orders (status, created_at) '
+            "WHERE status IN ('pending', 'confirmed', 'processing', 'shipped')"
+        )
+        op.execute('DROP INDEX CONCURRENTLY ix_orders_status_created')
+
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_users_active_alive '
+            'ON users (is_active, created_at) '
+            'WHERE is_active = true AND deleted_at IS NULL'
+        )
+        op.execute('DROP INDEX CONCURRENTLY ix_users_active')
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_users_active '
+            'ON users (is_active, created_at)'
+        )
+        op.execute('DROP INDEX CONCURRENTLY ix_users_active_alive')
+
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_orders_status_created '
+            'ON orders (status, created_at)'
+        )
+        op.execute('DROP INDEX CONCURRENTLY ix_orders_open_status_created')
@@ -0,0 +1,48 @@
+"""
+Replace the user/status order indexes with one covering index.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15
+
+status is stored in INCLUDE rather than as a key column: the user order
+listing filters only on user_id, and a (user_id, status, created_at) key
+would force a sort of every order the user has. The new index also makes
+the single-column ix_orders_user_id redundant. After VACUUM, verify the
+user order listing with:
+
+    EXPLAIN (ANALYZE, BUFFERS)
+    SELECT id, status, created_at, total FROM orders
+    WHERE user_id = :user_id
+    ORDER BY created_at DESC LIMIT 20;
+
+The plan should be an Index Only Scan with Heap Fetches: 0 and no Sort.
+0007 rebuilds the index on total_cents and adds item_count from 0006.
+"""
+
+from alembic import op
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_orders_user_created_covering '
+            'ON orders (user_id, created_at DESC) INCLUDE (id, status, total)'
+        )
+        op.execute('DROP INDEX CONCURRENTLY ix_orders_user_status')
+        op.execute('DROP INDEX CONCURRENTLY ix_orders_user_id')
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY ix_orders_user_id ON orders (user_id)')
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_orders_user_status '
+            'ON orders (user_id, status)'
+        )
+        op.execute('DROP INDEX CONCURRENTLY ix_orders_user_created_covering')
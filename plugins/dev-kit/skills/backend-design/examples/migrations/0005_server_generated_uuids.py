@@ -0,0 +1,31 @@
+"""
+Generate primary keys in PostgreSQL with gen_random_uuid().
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15
+
+gen_random_uuid() is built in from PostgreSQL 13. To switch to
+time-ordered keys, install pg_uuidv7 and use uuid_generate_v7() instead.
+"""
+
+from alembic import op
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+TABLES = ('users', 'addresses', 'products', 'orders', 'order_items')
+
+
+def upgrade():
+    for table in TABLES:
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()'
+        )
+
+
+def downgrade():
+    for table in TABLES:
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT')
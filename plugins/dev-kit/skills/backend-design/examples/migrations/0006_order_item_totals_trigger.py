@@ -0,0 +1,76 @@
+"""
+Denormalize order item counts and keep order totals in sync with a trigger.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-15
+
+recalc_order_totals() recomputes item_count, subtotal and total for every
+order touched by a write to order_items, including the previous order
+when an item moves. discount is a per-line amount.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+RECALC_FUNCTION = """
+CREATE FUNCTION recalc_order_totals() RETURNS trigger AS $$
+DECLARE
+    affected uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        affected := ARRAY[NEW.order_id];
+    ELSIF TG_OP = 'DELETE' THEN
+        affected := ARRAY[OLD.order_id];
+    ELSE
+        affected := ARRAY[OLD.order_id, NEW.order_id];
+    END IF;
+
+    UPDATE orders o
+    SET item_count = agg.item_count,
+        subtotal = agg.subtotal,
+        total = agg.subtotal + o.tax + o.shipping
+    FROM (
+        SELECT a.order_id,
+               count(oi.id) AS item_count,
+               coalesce(sum(oi.quantity * oi.unit_price - oi.discount), 0) AS subtotal
+        -- An UPDATE that keeps the order lists it twice; count each order once.
+        FROM (SELECT DISTINCT unnest(affected) AS order_id) a
+        LEFT JOIN order_items oi ON oi.order_id = a.order_id
+        GROUP BY a.order_id
+    ) agg
+    WHERE o.id = agg.order_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade():
+    op.add_column(
+        'orders',
+        sa.Column('item_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.execute(
+        'UPDATE orders o SET item_count = '
+        '(SELECT count(*) FROM order_items oi WHERE oi.order_id = o.id)'
+    )
+
+    op.execute(RECALC_FUNCTION)
+    op.execute(
+        'CREATE TRIGGER trg_order_items_recalc_totals '
+        'AFTER INSERT OR UPDATE OR DELETE ON order_items '
+        'FOR EACH ROW EXECUTE FUNCTION recalc_order_totals()'
+    )
+
+
+def downgrade():
+    op.execute('DROP TRIGGER trg_order_items_recalc_totals ON order_items')
+    op.execute('DROP FUNCTION recalc_order_totals()')
+    op.drop_column('orders', 'item_count')
@@ -0,0 +1,128 @@
+"""
+Store money as integer cents instead of double precision.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-15
+
+Each float column is copied into a new *_cents column and dropped, which
+also drops the CHECK constraints and indexes that referenced it; those
+are recreated on the cents columns. The totals trigger is disabled while
+order_items is rewritten and its function is replaced to sum cents.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# ##>: (table, float column, cents column)
+MONEY_COLUMNS = (
+    ('products', 'price', 'price_cents'),
+    ('orders', 'subtotal', 'subtotal_cents'),
+    ('orders', 'tax', 'tax_cents'),
+    ('orders', 'shipping', 'shipping_cents'),
+    ('orders', 'total', 'total_cents'),
+    ('order_items', 'unit_price', 'unit_price_cents'),
+    ('order_items', 'discount', 'discount_cents'),
+)
+
+# ##>: (constraint, table, money column) - recreated on whichever column set is live.
+CHECK_CONSTRAINTS = (
+    ('ck_product_price_positive', 'products', 'price'),
+    ('ck_order_total_positive', 'orders', 'total'),
+    ('ck_item_price_positive', 'order_items', 'unit_price'),
+    ('ck_item_discount_positive', 'order_items', 'discount'),
+)
+
+# ##>: Row-level trigger from 0006, paused while order_items is rewritten.
+TOTALS_TRIGGER = 'trg_order_items_recalc_totals'
+
+# ##>: Money columns in recalc_order_totals(), formatted with the live suffix.
+TRIGGER_COLUMNS = ('subtotal', 'total', 'tax', 'shipping', 'unit_price', 'discount')
+
+RECALC_FUNCTION = """
+CREATE OR REPLACE FUNCTION recalc_order_totals() RETURNS trigger AS $$
+DECLARE
+    affected uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        affected := ARRAY[NEW.order_id];
+    ELSIF TG_OP = 'DELETE' THEN
+        affected := ARRAY[OLD.order_id];
+    ELSE
+        affected := ARRAY[OLD.order_id, NEW.order_id];
+    END IF;
+
+    UPDATE orders o
+    SET item_count = agg.item_count,
+        {subtotal} = agg.subtotal,
+        {total} = agg.subtotal + o.{tax} + o.{shipping}
+    FROM (
+        SELECT a.order_id,
+               count(oi.id) AS item_count,
+               coalesce(
+                   sum(oi.quantity * oi.{unit_price} - oi.{discount}), 0
+               ) AS subtotal
+        -- An UPDATE that keeps the order lists it twice; count each order once.
+        FROM (SELECT DISTINCT unnest(affected) AS order_id) a
+        LEFT JOIN order_items oi ON oi.order_id = a.order_id
+        GROUP BY a.order_id
+    ) agg
+    WHERE o.id = agg.order_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def _convert(to_cents: bool):
+    for table, float_column, cents_column in MONEY_COLUMNS:
+        if to_cents:
+            source, target = float_column, cents_column
+        else:
+            source, target = cents_column, float_column
+        target_type = sa.Integer() if to_cents else sa.Float()
+        expression = f'round({source} * 100)' if to_cents else f'{source} / 100.0'
+
+        op.add_column(table, sa.Column(target, target_type, nullable=True))
+        op.execute(f'UPDATE {table} SET {target} = {expression}')
+        op.alter_column(table, target, existing_type=target_type, nullable=False)
+        op.drop_column(table, source)
+
+    for name, table, column in CHECK_CONSTRAINTS:
+        live_column = f'{column}_cents' if to_cents else column
+        op.create_check_constraint(name, table, f'{live_column} >= 0')
+
+    suffix = '_cents' if to_cents else ''
+    op.create_index(
+        'ix_products_active_price', 'products', ['is_active', f'price{suffix}']
+    )
+    # ##!: Dropping total took the covering index with it. Downgrade restores 0004's
+    # ##!: shape - with item_count, 0006's downgrade would drop it before 0004 can.
+    if to_cents:
+        include = 'id, status, item_count, total_cents'
+    else:
+        include = 'id, status, total'
+    op.execute(
+        'CREATE INDEX ix_orders_user_created_covering '
+        f'ON orders (user_id, created_at DESC) INCLUDE ({include})'
+    )
+    columns = {name: f'{name}{suffix}' for name in TRIGGER_COLUMNS}
+    op.execute(RECALC_FUNCTION.format(**columns))
+
+
+def upgrade():
+    op.execute(f'ALTER TABLE order_items DISABLE TRIGGER {TOTALS_TRIGGER}')
+    _convert(to_cents=True)
+    op.execute(f'ALTER TABLE order_items ENABLE TRIGGER {TOTALS_TRIGGER}')
+
+
+def downgrade():
+    op.execute(f'ALTER TABLE order_items DISABLE TRIGGER {TOTALS_TRIGGER}')
+    _convert(to_cents=False)
+    op.execute(f'ALTER TABLE order_items ENABLE TRIGGER {TOTALS_TRIGGER}')
@@ -0,0 +1,34 @@
+"""
+Enforce email uniqueness only among users that are not soft-deleted.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-15
+"""
+
+from alembic import op
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE UNIQUE INDEX CONCURRENTLY ix_users_email_lower_active '
+            'ON users (lower(email)) WHERE deleted_at IS NULL'
+        )
+        op.execute('ALTER TABLE users DROP CONSTRAINT users_email_key')
+        op.execute('DROP INDEX CONCURRENTLY ix_users_email_lower')
+
+
+def downgrade():
+    # ##!: Fails if a soft-deleted user shares an email with a live one.
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_users_email_lower ON users (lower(email))'
+        )
+        op.execute('ALTER TABLE users ADD CONSTRAINT users_email_key UNIQUE (email)')
+        op.execute('DROP INDEX CONCURRENTLY ix_users_email_lower_active')
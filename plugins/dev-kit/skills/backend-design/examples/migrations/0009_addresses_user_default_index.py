@@ -0,0 +1,37 @@
+"""
+Replace the single-column addresses.user_id index with (user_id, is_default DESC).
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-15
+
+The partial unique uq_user_default_address index is unchanged. Verify that
+the listing uses a single index scan with no Sort node:
+
+    EXPLAIN SELECT * FROM addresses
+    WHERE user_id = :user_id ORDER BY is_default DESC;
+"""
+
+from alembic import op
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_addresses_user_default '
+            'ON addresses (user_id, is_default DESC)'
+        )
+        op.execute('DROP INDEX CONCURRENTLY ix_addresses_user_id')
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_addresses_user_id ON addresses (user_id)'
+        )
+        op.execute('DROP INDEX CONCURRENTLY ix_addresses_user_default')
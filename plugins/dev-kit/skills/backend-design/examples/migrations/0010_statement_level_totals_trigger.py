@@ -0,0 +1,129 @@
+"""
+Recalculate order totals once per statement instead of once per item row.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-15
+
+A row-level trigger re-aggregates and rewrites the parent order for every
+item, so a COPY leaves one dead order tuple behind per imported item.
+Transition tables hand the statement's changed rows to one invocation
+that updates each affected order once. PostgreSQL only allows transition
+tables on single-event triggers, hence one trigger per event sharing the
+same function.
+"""
+
+from alembic import op
+
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+# ##&: Transition tables exist only for their own event - each branch reads its own.
+STATEMENT_FUNCTION = """
+CREATE OR REPLACE FUNCTION recalc_order_totals() RETURNS trigger AS $$
+DECLARE
+    affected uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(order_id) INTO affected FROM new_items;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(order_id) INTO affected FROM old_items;
+    ELSE
+        SELECT array_agg(order_id) INTO affected
+        FROM (
+            SELECT order_id FROM old_items
+            UNION ALL
+            SELECT order_id FROM new_items
+        ) changed;
+    END IF;
+
+    UPDATE orders o
+    SET item_count = agg.item_count,
+        subtotal_cents = agg.subtotal,
+        total_cents = agg.subtotal + o.tax_cents + o.shipping_cents
+    FROM (
+        SELECT a.order_id,
+               count(oi.id) AS item_count,
+               coalesce(
+                   sum(oi.quantity * oi.unit_price_cents - oi.discount_cents), 0
+               ) AS subtotal
+        FROM (SELECT DISTINCT unnest(affected) AS order_id) a
+        LEFT JOIN order_items oi ON oi.order_id = a.order_id
+        GROUP BY a.order_id
+    ) agg
+    WHERE o.id = agg.order_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# ##>: The row-level function as 0007 left it, restored on downgrade.
+ROW_FUNCTION = """
+CREATE OR REPLACE FUNCTION recalc_order_totals() RETURNS trigger AS $$
+DECLARE
+    affected uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        affected := ARRAY[NEW.order_id];
+    ELSIF TG_OP = 'DELETE' THEN
+        affected := ARRAY[OLD.order_id];
+    ELSE
+        affected := ARRAY[OLD.order_id, NEW.order_id];
+    END IF;
+
+    UPDATE orders o
+    SET item_count = agg.item_count,
+        subtotal_cents = agg.subtotal,
+        total_cents = agg.subtotal + o.tax_cents + o.shipping_cents
+    FROM (
+        SELECT a.order_id,
+               count(oi.id) AS item_count,
+               coalesce(
+                   sum(oi.quantity * oi.unit_price_cents - oi.discount_cents), 0
+               ) AS subtotal
+        FROM (SELECT DISTINCT unnest(affected) AS order_id) a
+        LEFT JOIN order_items oi ON oi.order_id = a.order_id
+        GROUP BY a.order_id
+    ) agg
+    WHERE o.id = agg.order_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# ##>: (trigger, event, REFERENCING clause)
+STATEMENT_TRIGGERS = (
+    ('trg_order_items_recalc_totals_insert', 'INSERT', 'NEW TABLE AS new_items'),
+    (
+        'trg_order_items_recalc_totals_update',
+        'UPDATE',
+        'OLD TABLE AS old_items NEW TABLE AS new_items',
+    ),
+    ('trg_order_items_recalc_totals_delete', 'DELETE', 'OLD TABLE AS old_items'),
+)
+
+
+def upgrade():
+    op.execute('DROP TRIGGER trg_order_items_recalc_totals ON order_items')
+    op.execute(STATEMENT_FUNCTION)
+    for name, event, referencing in STATEMENT_TRIGGERS:
+        op.execute(
+            f'CREATE TRIGGER {name} AFTER {event} ON order_items '
+            f'REFERENCING {referencing} '
+            'FOR EACH STATEMENT EXECUTE FUNCTION recalc_order_totals()'
+        )
+
+
+def downgrade():
+    for name, _, _ in STATEMENT_TRIGGERS:
+        op.execute(f'DROP TRIGGER {name} ON order_items')
+    op.execute(ROW_FUNCTION)
+    op.execute(
+        'CREATE TRIGGER trg_order_items_recalc_totals '
+        'AFTER INSERT OR UPDATE OR DELETE ON order_items '
+        'FOR EACH ROW EXECUTE FUNCTION recalc_order_totals()'
+    )
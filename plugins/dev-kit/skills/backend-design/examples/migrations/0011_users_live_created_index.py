@@ -0,0 +1,34 @@
+"""
+Index live users by (created_at DESC, id DESC) for keyset pagination.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-15
+
+The index matches the listing's ORDER BY and row-value seek, so each page
+is a bounded index range scan with no Sort node:
+
+    EXPLAIN SELECT id, email, name, created_at FROM users
+    WHERE deleted_at IS NULL AND (created_at, id) < (:created_at, :id)
+    ORDER BY created_at DESC, id DESC LIMIT 21;
+"""
+
+from alembic import op
+
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute(
+            'CREATE INDEX CONCURRENTLY ix_users_live_created '
+            'ON users (created_at DESC, id DESC) WHERE deleted_at IS NULL'
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY ix_users_live_created')
@@ -4,14 +4,16 @@ Example: SQLAlchemy model with relationships, constraints, and best practices.
 This example demonstrates:
 - Base model with common fields (id, timestamps)
 - Proper relationship definitions with cascade
+- Lazy relationships with per-query loading (see sqlalchemy-repository.py)
 - Database-level constraints
 - Index definitions
 - Type annotations with Mapped
 """
 
 from datetime import UTC, datetime
+from decimal import Decimal
 from enum import Enum
-from uuid import uuid4
+from uuid import UUID
 
 from sqlalchemy import (
     CheckConstraint,
@@ -21,8 +23,12 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    Uuid,
     func,
+    text,
 )
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -52,10 +58,13 @@ class TimestampMixin:
 class UUIDMixin:
     """Mixin providing UUID primary key."""
 
-    id: Mapped[str] = mapped_column(
-        String(36),
+    # ##>: Native 16-byte uuid generated by PostgreSQL, returned via RETURNING.
+    # ##>: With the pg_uuidv7 extension, uuid_generate_v7() gives time-ordered,
+    # ##>: append-only keys.
+    id: Mapped[UUID] = mapped_column(
+        Uuid,
         primary_key=True,
-        default=lambda: str(uuid4()),
+        server_default=text('gen_random_uuid()'),
     )
 
 
@@ -77,13 +86,44 @@ class OrderStatus(str, Enum):
     CANCELLED = 'cancelled'
 
 
+# ##>: Statuses still in flight - the only ones hot queries filter on.
+OPEN_ORDER_STATUSES = (
+    OrderStatus.PENDING,
+    OrderStatus.CONFIRMED,
+    OrderStatus.PROCESSING,
+    OrderStatus.SHIPPED,
+)
+_OPEN_ORDER_STATUS_SQL_LIST = (
+    '(' + ', '.join(f"'{s.value}'" for s in OPEN_ORDER_STATUSES) + ')'
+)
+
+
+# Column Helpers
+def money(cents_column: str) -> hybrid_property:
+    """Expose an integer cents column as an exact Decimal amount."""
+
+    def fget(self) -> Decimal | None:
+        cents = getattr(self, cents_column)
+        # ##&: Column defaults only apply at flush - a pending instance holds None.
+        return None if cents is None else Decimal(cents).scaleb(-2)
+
+    def fset(self, value: Decimal) -> None:
+        setattr(self, cents_column, int(Decimal(value).scaleb(2).to_integral_value()))
+
+    def expr(cls):
+        return getattr(cls, cents_column) / 100
+
+    return hybrid_property(fget, fset, expr=expr)
+
+
 # Models
 class User(BaseModel):
     """User account model."""
 
     __tablename__ = 'users'
 
-    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    # ##>: Unique among live users only - see ix_users_email_lower_active below.
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     is_active: Mapped[bool] = mapped_column(default=True)
@@ -96,20 +136,44 @@ class User(BaseModel):
     )
 
     # Relationships
+    # ##>: No eager default - routes opt in with selectinload() per query.
+    # ##>: No delete cascade - orders.user_id is ON DELETE RESTRICT, so deleting a
+    # ##>: user with orders fails in the database instead of the ORM deleting their
+    # ##>: order history first.
     orders: Mapped[list['Order']] = relationship(
         back_populates='user',
-        cascade='all, delete-orphan',
-        lazy='selectin',
+        cascade='save-update, merge',
+        passive_deletes='all',
     )
     addresses: Mapped[list['Address']] = relationship(
         back_populates='user',
         cascade='all, delete-orphan',
-        lazy='selectin',
     )
 
     __table_args__ = (
-        Index('ix_users_email_lower', func.lower(email)),
-        Index('ix_users_active', 'is_active', 'created_at'),
+        # ##>: Partial unique index - soft-deleted users release their email.
+        # ##>: Case-insensitive uniqueness implies exact uniqueness, so no separate
+        # ##>: index on email.
+        Index(
+            'ix_users_email_lower_active',
+            func.lower(email),
+            unique=True,
+            postgresql_where=text('deleted_at IS NULL'),
+        ),
+        # ##>: Partial index - only live accounts, which login/list queries target.
+        Index(
+            'ix_users_active_alive',
+            'is_active',
+            'created_at',
+            postgresql_where=text('is_active = true AND deleted_at IS NULL'),
+        ),
+        # ##>: Matches the keyset listing - live users by (created_at, id) DESC.
+        Index(
+            'ix_users_live_created',
+            text('created_at DESC'),
+            text('id DESC'),
+            postgresql_where=text('deleted_at IS NULL'),
+        ),
     )
 
 
@@ -118,10 +182,10 @@ class Address(BaseModel):
 
     __tablename__ = 'addresses'
 
-    user_id: Mapped[str] = mapped_column(
+    # ##>: Indexed by ix_addresses_user_default (leading column).
+    user_id: Mapped[UUID] = mapped_column(
         ForeignKey('users.id', ondelete='CASCADE'),
         nullable=False,
-        index=True,
     )
     label: Mapped[str] = mapped_column(String(50), nullable=False)
     street: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -135,13 +199,16 @@ class Address(BaseModel):
     user: Mapped['User'] = relationship(back_populates='addresses')
 
     __table_args__ = (
-        # ##>: Ensure only one default address per user.
-        UniqueConstraint(
+        # ##>: Ensure only one default address per user (partial unique index).
+        Index(
+            'uq_user_default_address',
             'user_id',
             'is_default',
-            name='uq_user_default_address',
-            postgresql_where='is_default = true',
+            unique=True,
+            postgresql_where=text('is_default = true'),
         ),
+        # ##>: Serves "addresses for user, default first" without a sort step.
+        Index('ix_addresses_user_default', 'user_id', text('is_default DESC')),
         CheckConstraint(
             "country ~ '^[A-Z]{2}$'",
             name='ck_address_country_iso',
@@ -157,14 +224,18 @@ class Product(BaseModel):
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     slug: Mapped[str] = mapped_column(String(220), unique=True, nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    price: Mapped[float] = mapped_column(nullable=False)
+    # ##>: Money is stored as integer cents - exact, and 4 bytes instead of 8.
+    price_cents: Mapped[int] = mapped_column(nullable=False)
     stock_quantity: Mapped[int] = mapped_column(default=0)
     is_active: Mapped[bool] = mapped_column(default=True)
 
+    # Decimal view over the cents column
+    price = money('price_cents')
+
     __table_args__ = (
-        CheckConstraint('price >= 0', name='ck_product_price_positive'),
+        CheckConstraint('price_cents >= 0', name='ck_product_price_positive'),
         CheckConstraint('stock_quantity >= 0', name='ck_product_stock_positive'),
-        Index('ix_products_active_price', 'is_active', 'price'),
+        Index('ix_products_active_price', 'is_active', 'price_cents'),
     )
 
 
@@ -173,44 +244,69 @@ class Order(BaseModel):
 
     __tablename__ = 'orders'
 
-    user_id: Mapped[str] = mapped_column(
+    # ##>: Indexed by ix_orders_user_created_covering (leading column).
+    user_id: Mapped[UUID] = mapped_column(
         ForeignKey('users.id', ondelete='RESTRICT'),
         nullable=False,
-        index=True,
     )
-    shipping_address_id: Mapped[str | None] = mapped_column(
+    shipping_address_id: Mapped[UUID | None] = mapped_column(
         ForeignKey('addresses.id', ondelete='SET NULL'),
         nullable=True,
     )
-    status: Mapped[str] = mapped_column(
-        String(20),
-        default=OrderStatus.PENDING.value,
+    # ##>: Native PostgreSQL enum - 4 bytes per value, no CHECK constraint to sync.
+    status: Mapped[OrderStatus] = mapped_column(
+        SQLEnum(
+            OrderStatus,
+            name='order_status',
+            native_enum=True,
+            values_callable=lambda statuses: [s.value for s in statuses],
+        ),
+        default=OrderStatus.PENDING,
         nullable=False,
     )
-    subtotal: Mapped[float] = mapped_column(default=0.0)
-    tax: Mapped[float] = mapped_column(default=0.0)
-    shipping: Mapped[float] = mapped_column(default=0.0)
-    total: Mapped[float] = mapped_column(default=0.0)
+    subtotal_cents: Mapped[int] = mapped_column(default=0)
+    tax_cents: Mapped[int] = mapped_column(default=0)
+    shipping_cents: Mapped[int] = mapped_column(default=0)
+    total_cents: Mapped[int] = mapped_column(default=0)
+    # ##>: Denormalized - subtotal_cents, total_cents and item_count are kept in sync
+    # ##>: by the statement-level recalc_order_totals() triggers on order_items
+    # ##>: (migration 0010).
+    item_count: Mapped[int] = mapped_column(default=0, server_default='0')
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Relationships
     user: Mapped['User'] = relationship(back_populates='orders')
     shipping_address: Mapped['Address | None'] = relationship()
+    # ##>: Never loaded implicitly - routes rendering line items use selectinload().
     items: Mapped[list['OrderItem']] = relationship(
         back_populates='order',
         cascade='all, delete-orphan',
-        lazy='selectin',
+        lazy='raise',
     )
 
+    # Decimal views over the cents columns
+    subtotal = money('subtotal_cents')
+    tax = money('tax_cents')
+    shipping = money('shipping_cents')
+    total = money('total_cents')
+
     __table_args__ = (
-        # ##>: Validate status against enum values.
-        CheckConstraint(
-            f"status IN ({', '.join(repr(s.value) for s in OrderStatus)})",
-            name='ck_order_valid_status',
+        CheckConstraint('total_cents >= 0', name='ck_order_total_positive'),
+        # ##>: Covering index - INCLUDE holds every ORDER_SUMMARY_COLUMNS column, so a
+        # ##>: user's order history is an index-only scan already in created_at order.
+        Index(
+            'ix_orders_user_created_covering',
+            'user_id',
+            text('created_at DESC'),
+            postgresql_include=['id', 'status', 'item_count', 'total_cents'],
+        ),
+        # ##>: Partial index - delivered/cancelled orders pile up but are rarely read.
+        Index(
+            'ix_orders_open_status_created',
+            'status',
+            'created_at',
+            postgresql_where=text(f'status IN {_OPEN_ORDER_STATUS_SQL_LIST}'),
         ),
-        CheckConstraint('total >= 0', name='ck_order_total_positive'),
-        Index('ix_orders_user_status', 'user_id', 'status'),
-        Index('ix_orders_status_created', 'status', 'created_at'),
     )
 
 
@@ -219,27 +315,31 @@ class OrderItem(BaseModel):
 
     __tablename__ = 'order_items'
 
-    order_id: Mapped[str] = mapped_column(
+    order_id: Mapped[UUID] = mapped_column(
         ForeignKey('orders.id', ondelete='CASCADE'),
         nullable=False,
         index=True,
     )
-    product_id: Mapped[str] = mapped_column(
+    product_id: Mapped[UUID] = mapped_column(
         ForeignKey('products.id', ondelete='RESTRICT'),
         nullable=False,
         index=True,
     )
     quantity: Mapped[int] = mapped_column(default=1)
-    unit_price: Mapped[float] = mapped_column(nullable=False)
-    discount: Mapped[float] = mapped_column(default=0.0)
+    unit_price_cents: Mapped[int] = mapped_column(nullable=False)
+    discount_cents: Mapped[int] = mapped_column(default=0)
 
     # Relationships
     order: Mapped['Order'] = relationship(back_populates='items')
     product: Mapped['Product'] = relationship()
 
+    # Decimal views over the cents columns
+    unit_price = money('unit_price_cents')
+    discount = money('discount_cents')
+
     __table_args__ = (
         UniqueConstraint('order_id', 'product_id', name='uq_order_product'),
         CheckConstraint('quantity > 0', name='ck_item_quantity_positive'),
-        CheckConstraint('unit_price >= 0', name='ck_item_price_positive'),
-        CheckConstraint('discount >= 0', name='ck_item_discount_positive'),
+        CheckConstraint('unit_price_cents >= 0', name='ck_item_price_positive'),
+        CheckConstraint('discount_cents >= 0', name='ck_item_discount_positive'),
     )
@@ -0,0 +1,289 @@
+"""
+Example: Async SQLAlchemy repositories for the user and order models.
+
+This example demonstrates:
+- Repository pattern over an AsyncSession
+- Explicit per-query loader options instead of eager relationship defaults
+- raiseload('*') to fail loudly on accidental lazy loads
+- Opt-in selectinload() for routes that render relationships
+- Column-only selects returning Row objects for read-only responses
+- INSERT ... ON CONFLICT DO NOTHING RETURNING for race-free creation
+- UPDATE/DELETE ... RETURNING to fold existence checks into the write
+- Keyset (seek) pagination on (created_at, id)
+- Denormalized order totals read without touching order_items
+- Planner-estimated counts instead of COUNT(*) on large tables
+- Bulk imports streamed with asyncpg COPY, bypassing the ORM
+"""
+
+import json
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Row, delete, func, select, text, tuple_, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
+
+# ##>: Models defined in examples/sqlalchemy-model.py.
+from app.models import Order, OrderItem, User
+
+# ##>: Columns rendered by UserResponse - reads skip ORM instantiation entirely.
+USER_RESPONSE_COLUMNS = (User.id, User.email, User.name, User.created_at)
+
+# ##>: Below this many estimated rows an exact COUNT(*) is cheap enough to run.
+EXACT_COUNT_THRESHOLD = 10_000
+
+# ##>: Order summary columns - item_count and total are maintained by trigger.
+ORDER_SUMMARY_COLUMNS = (
+    Order.id,
+    Order.status,
+    Order.item_count,
+    Order.total_cents,
+    Order.created_at,
+)
+
+# ##>: COPY column order - omitted item_count and updated_at use server defaults.
+ORDER_COPY_COLUMNS = (
+    'id',
+    'user_id',
+    'shipping_address_id',
+    'status',
+    'subtotal_cents',
+    'tax_cents',
+    'shipping_cents',
+    'total_cents',
+    'notes',
+    'created_at',
+)
+ORDER_ITEM_COPY_COLUMNS = (
+    'id',
+    'order_id',
+    'product_id',
+    'quantity',
+    'unit_price_cents',
+    'discount_cents',
+    'created_at',
+)
+
+
+class UserRepository:
+    """Data access for user accounts."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_by_id(self, user_id: UUID) -> Row | None:
+        """Fetch the response columns of a live user."""
+        # ##>: Soft-deleted users are hidden everywhere, not just from listings.
+        stmt = select(*USER_RESPONSE_COLUMNS).where(
+            User.id == user_id,
+            User.deleted_at.is_(None),
+        )
+        return (await self.session.execute(stmt)).one_or_none()
+
+    async def get_by_email(self, email: str) -> Row | None:
+        """Fetch the response columns of a live user by case-insensitive email."""
+        stmt = select(*USER_RESPONSE_COLUMNS).where(
+            func.lower(User.email) == email.lower(),
+            User.deleted_at.is_(None),
+        )
+        return (await self.session.execute(stmt)).one_or_none()
+
+    async def get_with_orders(self, user_id: UUID) -> User | None:
+        """Fetch a user and their orders for GET /users/{id}/orders."""
+        stmt = (
+            select(User)
+            .where(User.id == user_id, User.deleted_at.is_(None))
+            # ##>: Load orders in one IN query; anything deeper must be explicit.
+            .options(selectinload(User.orders).options(raiseload('*')))
+        )
+        return await self.session.scalar(stmt)
+
+    async def count(
+        self,
+        filters: dict[str, Any],
+        exact: bool = False,
+    ) -> tuple[int, bool]:
+        """Count listable users; returns (count, is_estimate)."""
+        conditions = self._list_conditions(filters)
+        if not exact:
+            estimate = await self._estimate_count(conditions)
+            # ##>: Small results are cheap to count exactly; estimates are noisiest.
+            if estimate >= EXACT_COUNT_THRESHOLD:
+                return estimate, True
+
+        count_query = select(func.count()).select_from(User).where(*conditions)
+        return await self.session.scalar(count_query), False
+
+    async def list_after(
+        self,
+        after: tuple[datetime, UUID] | None,
+        per_page: int,
+        filters: dict[str, Any],
+    ) -> tuple[list[Row], bool]:
+        """Return the user rows after a (created_at, id) key, newest first."""
+        rows_query = select(*USER_RESPONSE_COLUMNS).where(
+            *self._list_conditions(filters)
+        )
+        if after is not None:
+            # ##>: Seek past the last seen key - cost no longer grows with page depth.
+            rows_query = rows_query.where(tuple_(User.created_at, User.id) < after)
+        rows_query = rows_query.order_by(User.created_at.desc(), User.id.desc())
+        rows_query = rows_query.limit(per_page + 1)
+        rows = (await self.session.execute(rows_query)).all()
+
+        # ##>: The extra row only signals that another page exists.
+        return list(rows[:per_page]), len(rows) > per_page
+
+    async def list_paginated(
+        self,
+        page: int,
+        per_page: int,
+        filters: dict[str, Any],
+    ) -> list[Row]:
+        """Return one OFFSET page of user rows (deprecated, prefer list_after)."""
+        rows_query = (
+            select(*USER_RESPONSE_COLUMNS)
+            .where(*self._list_conditions(filters))
+            .order_by(User.created_at.desc(), User.id.desc())
+            .offset((page - 1) * per_page)
+            .limit(per_page)
+        )
+        return list((await self.session.execute(rows_query)).all())
+
+    @staticmethod
+    def _list_conditions(filters: dict[str, Any]) -> list[ColumnElement[bool]]:
+        # ##>: Soft-deleted users never list - ix_users_live_created serves the order.
+        conditions = [User.deleted_at.is_(None)]
+        conditions += [getattr(User, key) == value for key, value in filters.items()]
+        return conditions
+
+    async def _estimate_count(self, conditions: list[ColumnElement[bool]]) -> int:
+        # ##>: Planner row estimate - plan-only, and unlike pg_class.reltuples it
+        # ##>: applies deleted_at IS NULL, so soft-deleted users are not counted.
+        query = select(User.id).where(*conditions)
+        compiled = query.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={'literal_binds': True},
+        )
+        plan = await self.session.scalar(text(f'EXPLAIN (FORMAT JSON) {compiled}'))
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    async def create(self, **values: Any) -> Row | None:
+        """Insert a new user; return None when the email is already taken."""
+        stmt = (
+            insert(User)
+            .values(**values)
+            # ##>: One round trip, and the unique index arbitrates concurrent signups.
+            # ##>: Targets ix_users_email_lower_active, the only unique email index.
+            .on_conflict_do_nothing(
+                index_elements=[func.lower(User.email)],
+                index_where=User.deleted_at.is_(None),
+            )
+            .returning(*USER_RESPONSE_COLUMNS)
+        )
+        return (await self.session.execute(stmt)).one_or_none()
+
+    async def update(self, user_id: UUID, updates: dict[str, Any]) -> Row | None:
+        """Apply a partial update; return None when no live user matches."""
+        if not updates:
+            return await self.get_by_id(user_id)
+
+        stmt = (
+            update(User)
+            .where(User.id == user_id, User.deleted_at.is_(None))
+            .values(**updates)
+            .returning(*USER_RESPONSE_COLUMNS)
+        )
+        return (await self.session.execute(stmt)).one_or_none()
+
+    async def delete(self, user_id: UUID) -> bool:
+        """
+        Delete a user; return False when no live user matches.
+
+        Addresses cascade in the database. Orders are ON DELETE RESTRICT, so
+        deleting a user with orders raises IntegrityError.
+        """
+        stmt = (
+            delete(User)
+            .where(User.id == user_id, User.deleted_at.is_(None))
+            .returning(User.id)
+        )
+        return (await self.session.execute(stmt)).one_or_none() is not None
+
+
+class OrderRepository:
+    """Data access for orders."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_by_id(self, order_id: UUID) -> Order | None:
+        """Fetch an order for modification without loading its items."""
+        stmt = select(Order).where(Order.id == order_id).options(raiseload('*'))
+        return await self.session.scalar(stmt)
+
+    async def get_with_items(self, order_id: UUID) -> Order | None:
+        """Fetch an order with items and products for GET /orders/{id}/with-items."""
+        stmt = (
+            select(Order)
+            .where(Order.id == order_id)
+            .options(selectinload(Order.items).selectinload(OrderItem.product))
+        )
+        return await self.session.scalar(stmt)
+
+    async def list_for_user(self, user_id: UUID, limit: int) -> list[Row]:
+        """Return a user's most recent order summaries in a single query."""
+        stmt = (
+            select(*ORDER_SUMMARY_COLUMNS)
+            .where(Order.user_id == user_id)
+            .order_by(Order.created_at.desc())
+            .limit(limit)
+        )
+        return list((await self.session.execute(stmt)).all())
+
+    async def bulk_import(
+        self,
+        orders: Sequence[Mapping[str, Any]],
+        items: Sequence[Mapping[str, Any]],
+    ) -> None:
+        """
+        Stream historical orders and their items in with COPY.
+
+        Each mapping must provide every copy column as native Python values
+        (UUID, datetime, int cents); the caller generates ids so items can
+        reference their order. Both COPYs run in the session's transaction,
+        so the caller's commit or rollback covers them. Nothing enters the
+        identity map - re-query if ORM objects are needed. The totals
+        triggers are statement-level, so each COPY updates every affected
+        order once.
+        """
+        # ##~: The asyncpg adapter only sends BEGIN with the first statement - without
+        # ##~: one, COPY would run outside the session's transaction and autocommit.
+        await self.session.execute(text('SELECT 1'))
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        # ##>: The underlying asyncpg connection, now in the session's transaction.
+        driver = raw_connection.driver_connection
+
+        await driver.copy_records_to_table(
+            Order.__tablename__,
+            records=[
+                tuple(order[column] for column in ORDER_COPY_COLUMNS)
+                for order in orders
+            ],
+            columns=ORDER_COPY_COLUMNS,
+        )
+        await driver.copy_records_to_table(
+            OrderItem.__tablename__,
+            records=[
+                tuple(item[column] for column in ORDER_ITEM_COPY_COLUMNS)
+                for item in items
+            ],
+            columns=ORDER_ITEM_COPY_COLUMNS,
+        )